@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 
 # ==================== camera.py ====================
-import cv2
-import numpy as np
+import queue
+import threading
+import time
 from app.config import LIGHT_THRESHOLD
 
+# BT.601 luma weights in OpenCV's BGR channel order (same as COLOR_BGR2GRAY)
+BGR_LUMA_WEIGHTS = (0.114, 0.587, 0.299)
+
 class CameraReader:
     def __init__(self):
         self.camera = None
@@ -12,9 +16,14 @@ class CameraReader:
         self.max_light = 0
         self.roi = None  # kept for compatibility; unused with ROI removed
         self.last_frame = None  # <-- cached frame for GUI preview
+        self.frame_version = 0  # bumped on every new last_frame; lets the GUI skip repeats
+        self._frame_q = queue.Queue(maxsize=1)  # capture -> processing handoff (newest frame only)
+        self._capture_thread = None
+        self.read_errors = 0  # failed reads in the capture thread since start()
 
     def open_camera(self):
         """Open the camera device."""
+        import cv2  # deferred: keeps cv2 off the GUI cold-start path
         if self.camera is None or not self.camera.isOpened():
             self.camera = cv2.VideoCapture(0)
             if not self.camera.isOpened():
@@ -34,10 +43,13 @@ class CameraReader:
         if self.camera is None or not self.camera.isOpened():
             self.open_camera()
 
+        # VideoCapture.read() releases the GIL while it blocks on the driver,
+        # so Tk and the other workers keep running; don't hold a lock across it.
         ret, frame = self.camera.read()
         if not ret:
             raise RuntimeError("Failed to read frame from camera")
         self.last_frame = frame  # keep a copy for GUI preview
+        self.frame_version += 1
         return frame
 
     def set_roi(self, x, y, w, h):
@@ -47,14 +59,19 @@ class CameraReader:
     def measure_light_in_roi(self, frame):
         """
         Measure light intensity. With ROI disabled, use full frame mean (0-255).
+        The mean of the BT.601 luma equals the weighted sum of the per-channel
+        means, so no grayscale frame is materialised.
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        return float(np.mean(gray))
+        import cv2
+        b, g, r, _ = cv2.mean(frame)
+        wb, wg, wr = BGR_LUMA_WEIGHTS
+        return float(wb * b + wg * g + wr * r)
 
     def start(self):
         """Start monitoring."""
         self._running = True
         self.max_light = 0
+        self.read_errors = 0
         self.open_camera()
         print("[DEBUG] Camera monitoring started")
 
@@ -63,6 +80,65 @@ class CameraReader:
         self._running = False
         print(f"[DEBUG] Camera monitoring stopped. Max light: {self.max_light}")
 
+    def start_capture(self):
+        """
+        Start monitoring with a dedicated capture thread that only reads frames
+        into a 1-slot queue. Consume them with get_frame(); stop with stop().
+        The capture thread owns the device from here on and closes it on exit.
+        """
+        # A reader left over from a stalled run must be gone before we reopen
+        if not self.join_capture(timeout=5.0):
+            raise RuntimeError("Previous camera capture thread is still running")
+        self.start()
+        self._drain_queue()
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+
+    def join_capture(self, timeout=1.0):
+        """
+        Wait for the capture thread to exit (call after stop()). Returns True
+        once it has; on timeout the handle is kept (it may still be blocked in
+        read()) and the thread releases the camera itself when it gets out.
+        """
+        t = self._capture_thread
+        if t is not None:
+            t.join(timeout=timeout)
+            if t.is_alive():
+                return False
+            self._capture_thread = None
+        return True
+
+    def get_frame(self, timeout=None):
+        """Return the newest captured frame. Raises queue.Empty on timeout."""
+        return self._frame_q.get(timeout=timeout)
+
+    def _drain_queue(self):
+        try:
+            self._frame_q.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _capture_loop(self):
+        """Capture stage: read frames as fast as the camera delivers them, drop-oldest."""
+        try:
+            while self._running:
+                try:
+                    frame = self.read_frame()
+                except Exception as e:
+                    self.read_errors += 1
+                    print(f"[ERROR] Camera read failed: {e}")
+                    time.sleep(0.1)
+                    continue
+                # Single producer: after dropping the stale frame the slot is free
+                self._drain_queue()
+                try:
+                    self._frame_q.put_nowait(frame)
+                except queue.Full:
+                    pass
+        finally:
+            # Release from this thread so it never races an in-flight read()
+            self.close_camera()
+
     def loop(self, sleep_s=0.05):
         """Run the camera polling loop. Call this in a dedicated thread."""
         import time
@@ -83,4 +159,3 @@ class CameraReader:
         finally:
             self.close_camera()
             print(f"[DEBUG] Camera monitoring thread stopped. Max light: {self.max_light}")
-
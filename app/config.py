@@ -15,6 +15,12 @@ ROTATION_DELAY_S = 3  # seconds between rotations
 # Light threshold for chemiluminescence detection
 # Mean brightness value (0-255) above this indicates presence of luminol reaction (FAILED)
 LIGHT_THRESHOLD = 0.6  # > threshold => FAILED (adjust based on testing)
+# CPU core the analysis thread is pinned to (Linux only); None leaves it unpinned
+ANALYSIS_CPU = 2
+# (w, h) frames are downscaled to for the heatmap max-projection; None keeps full frames.
+# Downscaling averages neighbouring pixels, so small bright spots are diluted
+# (a lone 255 pixel becomes ~64 at half size) in the heatmap and pixel percentage.
+ANALYSIS_SIZE = None
 
 # --- Files/Paths ---
 DB_FILE = "/var/lib/tool-test/test_results.db"
@@ -24,3 +30,6 @@ STATE_DIR = "/var/lib/tool-test"
 # --- UI ---
 WINDOW_GEOMETRY = "800x480"
 BG_DARK = "#222"
+# Run the preview resize through OpenCL (cv2.UMat) when the
+# OpenCV build has a usable device; falls back to the CPU path otherwise.
+PREVIEW_USE_OPENCL = True
@@ -3,19 +3,21 @@
 
 import sys
 import os
+import pathlib
+import queue
 import sqlite3
 import time
 import threading
 import tkinter as tk
+from contextlib import closing
 from tkinter import messagebox
 from datetime import datetime
-from PIL import Image, ImageTk
-import cv2
 import numpy as np
 import RPi.GPIO as GPIO
 
 from app.config import (
-    WINDOW_GEOMETRY, BG_DARK, ROTATIONS, ROTATION_DELAY_S, LIGHT_THRESHOLD  # LIGHT_THRESHOLD unused now
+    WINDOW_GEOMETRY, BG_DARK, ROTATIONS, ROTATION_DELAY_S, LIGHT_THRESHOLD,  # LIGHT_THRESHOLD unused now
+    PREVIEW_USE_OPENCL, ANALYSIS_CPU, ANALYSIS_SIZE,
 )
 from app.motor import StepperMotor
 from app.camera import CameraReader
@@ -25,6 +27,21 @@ from app.db import init_db, save_run  # DB split: external module
 GUARD_ABS = 0.10      # absolute guard band (brightness units)
 GUARD_SIGMA = 3.0     # multiplier on baseline std dev
 
+# timestamp_id -> filename-safe id (":" and "." -> "-", " " -> "_")
+_FILENAME_TRANS = str.maketrans({":": "-", " ": "_", ".": "-"})
+
+
+def _percentile(values, q):
+    """
+    Same result as np.percentile(values, q) (linear interpolation), but via
+    np.partition: O(n) selection of the two neighbours instead of a full sort.
+    """
+    pos = (q / 100.0) * (values.size - 1)
+    lo = int(pos)
+    hi = min(lo + 1, values.size - 1)
+    part = np.partition(values, (lo, hi))
+    return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+
 
 class TestApp:
     def __init__(self, root):
@@ -37,24 +54,40 @@ class TestApp:
 
         self.container = tk.Frame(self.root, bg=BG_DARK)
         self.container.pack(fill="both", expand=True)
+        self._home_frame = None            # persistent home screen (see show_home_screen)
 
         self.camera = CameraReader()
         self.max_light = 0.0
         self.dynamic_threshold = None       # baseline p95
         self.effective_threshold = None     # baseline p95 + guard band
 
+        # heavy imports (cv2, PIL.ImageTk) are deferred until after first paint
+        self._heavy_libs_loaded = False
+
         # progress animation bookkeeping
         self._progress_after_id = None
         self._animating = False
+        self._next_tick_ms = 0.0           # monotonic deadline of the next dots update
 
         # camera preview bookkeeping
         self._camera_preview_id = None
         self.preview_w = None
         self.preview_h = None
+        self._disp_buf = None              # preallocated resize output (BGR, preview size)
+        self._use_opencl = None            # decided on first preview frame
+        self._preview_photo = None         # ImageTk.PhotoImage reused across preview frames
+        self._preview_seen_version = None  # camera.frame_version last drawn
 
         # heatmap accumulation (per-run)
-        self._heatmap_max = None           # np.ndarray (float32), max-projection of grayscale frames
+        self._heatmap_max = None           # np.ndarray (uint8), max-projection of grayscale frames
+        self._heatmap_full_size = None     # (w, h) of the camera frames; heatmap is upscaled to it
+        self._small_buf = None             # reused analysis-size BGR frame
+        self._gray_buf = None              # reused analysis-size grayscale frame
         self.last_heatmap_path = None      # str path to saved heatmap PNG
+        self.last_heatmap_bgr = None       # in-memory colored heatmap (result screens don't wait on disk)
+        self._norm_u8 = None               # reused heatmap buffers: normalised (analysis size),
+        self._norm_full = None             #   normalised upscaled to camera size,
+        self._colored = None               #   and colourised BGR
         self.last_pct_above_thr = None     # float percentage of pixels over effective threshold
 
         # legacy preview reader placeholders (unused now)
@@ -78,6 +111,11 @@ class TestApp:
         self._mist_jog_thread = None
         self._mist_jog_stop = None
 
+        # Background writer for heatmap PNGs: encode + disk I/O stay off run_test
+        self._io_q = queue.Queue()
+        self._io_thread = threading.Thread(target=self._io_worker, daemon=True)
+        self._io_thread.start()
+
         # Initialize DB schema
         init_db()
 
@@ -208,10 +246,18 @@ class TestApp:
         self.stop_camera_preview()
         try:
             self.camera.stop()
-            self.camera.close_camera()
+            # If a capture thread is stuck in read() it releases the camera itself
+            if self.camera.join_capture(timeout=0.5):
+                self.camera.close_camera()
         except Exception:
             pass
         self._gpio_cleanup()
+
+        # Let queued heatmap writes land; the writer is a daemon thread and
+        # would otherwise be killed mid-file at interpreter exit
+        self._io_q.put(None)
+        self._io_thread.join(timeout=2.0)
+
         self.root.after(50, self.root.destroy)
 
     def clear_screen(self):
@@ -223,7 +269,10 @@ class TestApp:
         self.stop_progress_animation()
         self.stop_camera_preview()
         for w in self.container.winfo_children():
-            w.destroy()
+            if w is self._home_frame:
+                w.pack_forget()  # kept alive for reuse
+            else:
+                w.destroy()
         self.container.unbind("<Button-1>")
         self.root.after(0, self.root.focus_force)
 
@@ -231,24 +280,39 @@ class TestApp:
     def show_home_screen(self):
         self.clear_screen()
 
+        # Home is built once and re-packed; it's the most visited screen
+        if self._home_frame is None:
+            self._build_home_frame()
+        self._home_frame.pack(fill="both", expand=True)
+        self.start_btn.config(state="normal")
+
+        # Warm the import cache while the user reads the home screen
+        if not self._heavy_libs_loaded:
+            self._heavy_libs_loaded = True
+            threading.Thread(target=self._preload_heavy_libs, daemon=True).start()
+
+    def _build_home_frame(self):
+        """Create the persistent home-screen widgets (called once)."""
+        self._home_frame = tk.Frame(self.container, bg=BG_DARK)
+        parent = self._home_frame
+
         title = tk.Label(
-            self.container, text="Bloodray Automated Tool Test System",
+            parent, text="Bloodray Automated Tool Test System",
             font=("Arial", 26, "bold"), fg="white", bg=BG_DARK
         )
         title.pack(pady=(18, 8))
 
         self.start_btn = tk.Button(
-            self.container, text="START TEST",
+            parent, text="START TEST",
             font=("Arial", 22, "bold"),
             bg="#4CAF50", fg="white", activebackground="#45a049",
             relief="flat", command=self.start_test_thread
         )
         self.start_btn.pack(pady=(10, 12), ipadx=36, ipady=16)
-        self.start_btn.config(state="normal")
 
         # LIVE PREVIEW button (camera only, no mist/motor/DB)
         self.live_btn = tk.Button(
-            self.container, text="LIVE PREVIEW",
+            parent, text="LIVE PREVIEW",
             font=("Arial", 20, "bold"),
             bg="#9C27B0", fg="white", activebackground="#7B1FA2",
             relief="flat", command=self.start_live_preview
@@ -257,7 +321,7 @@ class TestApp:
 
         # MISTING JOG button (run mist pump until user stops)
         self.mist_btn = tk.Button(
-            self.container, text="MISTING JOG",
+            parent, text="MISTING JOG",
             font=("Arial", 20, "bold"),
             bg="#FF9800", fg="white", activebackground="#F57C00",
             relief="flat", command=self.start_mist_jog
@@ -266,24 +330,38 @@ class TestApp:
 
         # EXPORT TO EXCEL button
         export_btn = tk.Button(
-            self.container, text="EXPORT TO EXCEL",
+            parent, text="EXPORT TO EXCEL",
             font=("Arial", 18, "bold"),
             bg="#2196F3", fg="white", activebackground="#1976D2",
             relief="flat", command=self.export_to_excel
         )
         export_btn.pack(pady=(8, 12), ipadx=18, ipady=10)
 
+    def _preload_heavy_libs(self):
+        """
+        Import cv2/PIL on a background thread so the first preview opens fast
+        without blocking the Tk loop (a START tap meanwhile just waits on the
+        import lock for whatever is still loading).
+        """
+        try:
+            import cv2  # noqa: F401
+            from PIL import Image, ImageTk  # noqa: F401
+        except Exception:
+            pass
+
     def show_progress_screen(self):
         """Live camera preview with animated LOADING... in top-right."""
         self.clear_screen()
 
         self.preview_w = 780
         self.preview_h = 480
+        self._alloc_preview_buffers()
         self.camera_canvas = tk.Canvas(
             self.container, width=self.preview_w, height=self.preview_h,
             bg="black", highlightthickness=0
         )
         self.camera_canvas.pack(pady=(8, 8))
+        self.camera_canvas.bind("<Map>", self._on_preview_canvas_mapped)
 
         # Animated LOADING... badge (top-right overlay)
         self.loading_label = tk.Label(
@@ -306,11 +384,13 @@ class TestApp:
 
         self.preview_w = 600
         self.preview_h = 400
+        self._alloc_preview_buffers()
         self.camera_canvas = tk.Canvas(
             self.container, width=self.preview_w, height=self.preview_h,
             bg="black", highlightthickness=0
         )
         self.camera_canvas.pack(pady=(18, 10))
+        self.camera_canvas.bind("<Map>", self._on_preview_canvas_mapped)
 
         stop_btn = tk.Button(
             self.container, text="STOP LIVE PREVIEW",
@@ -405,13 +485,13 @@ class TestApp:
         time_label.place(relx=0.99, rely=0.02, anchor="ne")
 
         # Tap -> heatmap screen if we have one; otherwise go home
-        if self.last_heatmap_path and os.path.exists(self.last_heatmap_path):
+        if self._has_heatmap():
             result_label.bind("<Button-1>", lambda e: self.show_heatmap_screen())
         else:
             result_label.bind("<Button-1>", lambda e: self.show_home_screen())
 
     def show_heatmap_screen(self):
-        """Second post-result screen: show saved heatmap PNG; tap -> home."""
+        """Second post-result screen: show the run's heatmap; tap -> home."""
         self.clear_screen()
 
         bg = "#111111"
@@ -438,12 +518,16 @@ class TestApp:
         canvas.pack(pady=(4, 12))
 
         # Load & fit image
-        if self.last_heatmap_path and os.path.exists(self.last_heatmap_path):
+        if self._has_heatmap():
             try:
-                img_bgr = cv2.imread(self.last_heatmap_path, cv2.IMREAD_COLOR)
+                import cv2
+                from PIL import Image, ImageTk
+                # Prefer the in-memory copy; the PNG may still be in the write queue
+                img_bgr = self.last_heatmap_bgr
+                if img_bgr is None:
+                    img_bgr = cv2.imread(self.last_heatmap_path, cv2.IMREAD_COLOR)
                 disp = cv2.resize(img_bgr, (780, 440), interpolation=cv2.INTER_AREA)
-                disp_rgb = cv2.cvtColor(disp, cv2.COLOR_BGR2RGB)
-                pil = Image.fromarray(disp_rgb)
+                pil = Image.frombuffer("RGB", (780, 440), disp, "raw", "BGR", 0, 1)
                 photo = ImageTk.PhotoImage(pil)
                 canvas.create_image(0, 0, anchor=tk.NW, image=photo)
                 canvas.image = photo
@@ -475,29 +559,90 @@ class TestApp:
                 pass
             self._camera_preview_id = None
 
+    def _alloc_preview_buffers(self):
+        """
+        (Re)allocate the preview output buffers for the current preview size and
+        drop the previous canvas' PhotoImage (a new canvas is about to be made).
+        """
+        self._preview_photo = None
+        shape = (self.preview_h, self.preview_w, 3)
+        if self._disp_buf is None or self._disp_buf.shape != shape:
+            self._disp_buf = np.empty(shape, dtype=np.uint8)
+
+    def _preview_opencl_enabled(self, cv2):
+        """Decide once whether the preview can run through OpenCL (cv2.UMat)."""
+        if self._use_opencl is None:
+            self._use_opencl = False
+            if PREVIEW_USE_OPENCL:
+                try:
+                    if cv2.ocl.haveOpenCL():
+                        cv2.ocl.setUseOpenCL(True)
+                        self._use_opencl = bool(cv2.ocl.useOpenCL())
+                except Exception:
+                    self._use_opencl = False
+        return self._use_opencl
+
+    def _on_preview_canvas_mapped(self, _event=None):
+        """Canvas became visible: render now instead of waiting out the slow poll."""
+        if self._camera_preview_id is not None:
+            self.stop_camera_preview()
+            self._update_camera_preview()
+
     def _update_camera_preview(self):
         """
         GUI preview only uses the latest frame captured by the camera thread.
         It does NOT call read_frame() itself to avoid multiple threads hitting
         the VideoCapture at the same time.
         """
+        import cv2
+        from PIL import Image, ImageTk
         try:
             if not hasattr(self, 'camera_canvas') or not self.camera_canvas.winfo_exists():
                 self.stop_camera_preview()
                 return
 
+            # Canvas not on screen: poll slowly and skip the work (<Map> wakes us early)
+            if not self.camera_canvas.winfo_ismapped():
+                self._camera_preview_id = self.root.after(500, self._update_camera_preview)
+                return
+
             frame = getattr(self.camera, "last_frame", None)
             if frame is None:
                 self._camera_preview_id = self.root.after(33, self._update_camera_preview)
                 return
 
-            disp = cv2.resize(frame, (self.preview_w, self.preview_h), interpolation=cv2.INTER_AREA)
-            frame_rgb = cv2.cvtColor(disp, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            photo = ImageTk.PhotoImage(image=img)
+            # Same frame as last tick (camera slower than the UI): check back soon
+            # rather than re-resizing and re-pasting identical pixels
+            version = self.camera.frame_version
+            if version == self._preview_seen_version and self._preview_photo is not None:
+                self._camera_preview_id = self.root.after(10, self._update_camera_preview)
+                return
+            self._preview_seen_version = version
 
-            self.camera_canvas.create_image(0, 0, anchor=tk.NW, image=photo)
-            self.camera_canvas.image = photo
+            disp = None
+            if self._preview_opencl_enabled(cv2):
+                # UMat.get() has no dst, so this path downloads into a fresh
+                # array every tick (the CPU path below reuses _disp_buf)
+                try:
+                    disp = cv2.resize(cv2.UMat(frame), (self.preview_w, self.preview_h), interpolation=cv2.INTER_AREA).get()
+                except Exception as e:
+                    # Driver/ICD failure: fall back to the CPU path for good
+                    print(f"[WARN] OpenCL preview failed, using CPU resize: {e}", file=sys.stderr)
+                    self._use_opencl = False
+            if disp is None:
+                # Reuse the preallocated buffer instead of allocating a new frame per tick
+                disp = cv2.resize(frame, (self.preview_w, self.preview_h), dst=self._disp_buf, interpolation=cv2.INTER_AREA)
+            # PIL swaps BGR->RGB while unpacking (a copy it makes anyway), so no cvtColor pass
+            img = Image.frombuffer("RGB", (self.preview_w, self.preview_h), disp, "raw", "BGR", 0, 1)
+
+            # One PhotoImage + one canvas item per canvas; later frames are pasted
+            # into it (a new create_image per tick would pile up canvas items)
+            if self._preview_photo is None:
+                self._preview_photo = ImageTk.PhotoImage(image=img)
+                self.camera_canvas.create_image(0, 0, anchor=tk.NW, image=self._preview_photo)
+                self.camera_canvas.image = self._preview_photo
+            else:
+                self._preview_photo.paste(img)
 
             self._camera_preview_id = self.root.after(33, self._update_camera_preview)  # ~30 FPS
         except Exception:
@@ -506,6 +651,7 @@ class TestApp:
     # ---------- animation ----------
     def start_progress_animation(self):
         self._animating = True
+        self._next_tick_ms = time.monotonic() * 1000.0
         self._animate_tick()
 
     def stop_progress_animation(self):
@@ -520,11 +666,20 @@ class TestApp:
     def _animate_tick(self):
         if not self._animating:
             return
-        if hasattr(self, "loading_label") and self.loading_label.winfo_exists():
-            dots = "." * (self.progress_dots % 4)
-            self.loading_label.config(text=f"LOADING{dots}")
-            self.progress_dots += 1
-        self._progress_after_id = self.root.after(500, self._animate_tick)
+        now = time.monotonic() * 1000.0
+        if now >= self._next_tick_ms - 50:
+            if hasattr(self, "loading_label") and self.loading_label.winfo_exists():
+                dots = "." * (self.progress_dots % 4)
+                self.loading_label.config(text=f"LOADING{dots}")
+                self.progress_dots += 1
+            # Stay on a fixed 500 ms grid; if Tk was blocked, skip the missed
+            # slots rather than firing them back-to-back
+            self._next_tick_ms += 500.0
+            if self._next_tick_ms <= now:
+                missed = int((now - self._next_tick_ms) // 500.0) + 1
+                self._next_tick_ms += 500.0 * missed
+        delay = max(1, int(self._next_tick_ms - now))
+        self._progress_after_id = self.root.after(delay, self._animate_tick)
 
     # ---------- live preview control ----------
     def _live_preview_worker(self, stop_event: threading.Event):
@@ -678,7 +833,9 @@ class TestApp:
             except ImportError:
                 Workbook = None
 
-            with sqlite3.connect(db_path) as con:
+            # Read-only URI connection: export never takes a write lock on the
+            # live DB. closing() because sqlite3's own context manager doesn't close.
+            with closing(sqlite3.connect(pathlib.Path(db_path).as_uri() + "?mode=ro", uri=True)) as con:
                 cur = con.cursor()
                 cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name;")
                 tables = [r[0] for r in cur.fetchall()]
@@ -687,21 +844,19 @@ class TestApp:
                     return
 
                 if Workbook is not None:
-                    wb = Workbook()
-                    # Remove default sheet to avoid empty "Sheet"
-                    default_ws = wb.active
-                    wb.remove(default_ws)
+                    # Write-only workbook streams rows to disk instead of keeping
+                    # a cell object per value in RAM (starts with no default sheet)
+                    wb = Workbook(write_only=True)
 
                     for table in tables:
                         cur.execute(f"SELECT * FROM {table};")
-                        rows = cur.fetchall()
                         headers = [d[0] for d in cur.description]
 
                         safe_name = table[:31].replace(":", "_").replace("/", "_").replace("\\", "_").replace("*", "_").replace("?", "_").replace("[", "(").replace("]", ")")
                         ws = wb.create_sheet(title=safe_name)
                         ws.append(headers)
-                        for r in rows:
-                            ws.append(list(r))
+                        for r in cur:  # iterate the cursor: rows are fetched as written
+                            ws.append(r)
 
                     wb.save(xlsx_path)
                     messagebox.showinfo("Export Complete", f"Exported to Excel:\n{xlsx_path}")
@@ -713,14 +868,13 @@ class TestApp:
                         return
 
                     cur.execute("SELECT * FROM test_runs;")
-                    rows = cur.fetchall()
                     headers = [d[0] for d in cur.description]
 
                     import csv
                     with open(csv_path, "w", newline="", encoding="utf-8") as f:
                         writer = csv.writer(f)
                         writer.writerow(headers)
-                        writer.writerows(rows)
+                        writer.writerows(cur)
                     messagebox.showinfo("Export Complete", f"openpyxl not installed.\nExported CSV instead:\n{csv_path}")
 
         except Exception as e:
@@ -736,7 +890,9 @@ class TestApp:
             self.metrics["total_start"] = time.perf_counter()
         # reset heatmap accumulators
         self._heatmap_max = None
+        self._heatmap_full_size = None
         self.last_heatmap_path = None
+        self.last_heatmap_bgr = None
         self.last_pct_above_thr = None
 
         t = threading.Thread(target=self.run_test, daemon=True)
@@ -764,7 +920,8 @@ class TestApp:
         BASELINE_SECONDS = 2.0
         SAMPLE_PERIOD_S = 0.05  # 20 Hz
         num_samples = max(5, int(BASELINE_SECONDS / SAMPLE_PERIOD_S))
-        samples = []
+        sample_buf = np.empty(num_samples, dtype=np.float64)  # filled in place; no per-sample boxing
+        n_samples = 0
 
         with self._lock:
             self.metrics["baseline_start"] = time.perf_counter()
@@ -774,24 +931,33 @@ class TestApp:
         except Exception:
             pass
 
+        # Pace samples on absolute deadlines so read/measure time doesn't
+        # stretch the period (a plain sleep-after-read ran well under 20 Hz)
+        next_t = time.monotonic()
         for _ in range(num_samples):
             try:
                 frame = self.camera.read_frame()
                 self.camera.last_frame = frame
-                lv = self.camera.measure_light_in_roi(frame)  # full-frame mean
-                samples.append(lv)
+                sample_buf[n_samples] = self.camera.measure_light_in_roi(frame)  # full-frame mean
+                n_samples += 1
                 with self._lock:
                     self.metrics["frames_total"] += 1
                     self.metrics["frames_baseline"] += 1
             except Exception:
                 with self._lock:
                     self.metrics["read_errors"] += 1
-            time.sleep(SAMPLE_PERIOD_S)
+            next_t += SAMPLE_PERIOD_S
+            remaining = next_t - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                next_t = time.monotonic()  # behind schedule: don't burst to catch up
 
         with self._lock:
             self.metrics["baseline_end"] = time.perf_counter()
 
-        if not samples:
+        b_means = sample_buf[:n_samples]  # view of the filled part, no copy
+        if n_samples == 0:
             self.dynamic_threshold = 255.0
             self.effective_threshold = 255.0
             with self._lock:
@@ -802,13 +968,13 @@ class TestApp:
                 self.metrics["guard_band"] = None
                 self.metrics["effective_threshold"] = 255.0
         else:
-            self.dynamic_threshold = float(np.percentile(samples, 95))
-            b_mean = float(np.mean(samples))
-            b_std = float(np.std(samples, ddof=1)) if len(samples) > 1 else 0.0
+            self.dynamic_threshold = _percentile(b_means, 95)
+            b_mean = float(b_means.mean())
+            b_std = float(b_means.std(ddof=1)) if b_means.size > 1 else 0.0
             guard = max(GUARD_ABS, GUARD_SIGMA * b_std)
             self.effective_threshold = float(self.dynamic_threshold + guard)
             with self._lock:
-                self.metrics["baseline_samples"] = samples
+                self.metrics["baseline_samples"] = b_means.tolist()  # JSON-serialisable for save_run
                 self.metrics["baseline_mean"] = b_mean
                 self.metrics["baseline_std"] = b_std
                 self.metrics["baseline_p95"] = self.dynamic_threshold
@@ -894,7 +1060,10 @@ class TestApp:
             self.camera.stop()
         except Exception:
             pass
-        camera_thread.join(timeout=1.0)
+        # No timeout: camera_loop's teardown is itself bounded (get_frame 0.1 s +
+        # join_capture 1 s) and merges its counters there, so metrics are
+        # complete and no longer written by it once this returns
+        camera_thread.join()
 
         with self._lock:
             self.metrics["analysis_end"] = time.perf_counter()
@@ -934,54 +1103,127 @@ class TestApp:
     def camera_loop(self):
         """
         Post-baseline measurement loop:
-        - reads frames
-        - updates last_frame for preview
+        - consumes frames from the camera capture thread
         - tracks max_light across frames
         - accumulates per-pixel max-projection into self._heatmap_max
         - captures time to first threshold exceed (if any)
+
+        Runs as a thread, not a process: the per-frame work is OpenCV/NumPy
+        calls that release the GIL, and the preview and heatmap read the
+        frames in-process without any copying.
         """
+        import cv2
+        # Per-frame calls are too small for OpenCV's worker pool to pay off;
+        # run them inline on this thread (pinned below, away from the Tk core).
+        cv2.setNumThreads(1)
+        # Per-frame bookkeeping stays local and is merged into self.metrics
+        # about once a second (and on exit), instead of locking every frame
+        frames = 0
+        first_exceed = None
+        with self._lock:
+            analysis_start = self.metrics["analysis_start"]
+
+        def flush():
+            nonlocal frames
+            with self._lock:
+                self.metrics["frames_total"] += frames
+                self.metrics["frames_analysis"] += frames
+                if (first_exceed is not None) and (self.metrics["first_exceed_time"] is None):
+                    self.metrics["first_exceed_time"] = first_exceed
+            frames = 0
+
+        last_flush = time.perf_counter()
         try:
-            self.camera.start()  # ensures _running=True and camera opened
+            # Capture runs on the camera's own thread (which also updates
+            # last_frame for the preview); get_frame() blocks until the next
+            # frame, so the camera frame rate paces this loop.
+            self.camera.start_capture()
+            # Pin only now: threads inherit their creator's CPU mask, and the
+            # capture thread must stay free to decode on another core
+            if ANALYSIS_CPU is not None:
+                try:
+                    os.sched_setaffinity(0, {ANALYSIS_CPU})  # 0 = calling thread on Linux
+                except (AttributeError, OSError, ValueError):
+                    pass
             while getattr(self.camera, "_running", False):
                 try:
-                    frame = self.camera.read_frame()
-                    self.camera.last_frame = frame
-
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY).astype(np.float32)
+                    frame = self.camera.get_frame(timeout=0.1)
+                except queue.Empty:
+                    continue
+                try:
+                    if self._heatmap_full_size is None:
+                        self._heatmap_full_size = (frame.shape[1], frame.shape[0])
+                    # Brightness on the full frame with the baseline's estimator,
+                    # so lv and effective_threshold are on the same scale
+                    lv = self.camera.measure_light_in_roi(frame)
+
+                    # Max-projection at ANALYSIS_SIZE (if set); outputs land in
+                    # reused buffers, allocated on the first frame only
+                    if ANALYSIS_SIZE is not None:
+                        self._small_buf = cv2.resize(frame, ANALYSIS_SIZE, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+                        frame = self._small_buf
+
+                    # uint8 max-projection is exact and moves 4x fewer bytes than float32
+                    self._gray_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+                    gray = self._gray_buf
 
                     if self._heatmap_max is None:
                         self._heatmap_max = gray.copy()
                     else:
-                        np.maximum(self._heatmap_max, gray, out=self._heatmap_max)
-
-                    lv = float(np.mean(gray))
+                        cv2.max(self._heatmap_max, gray, dst=self._heatmap_max)
 
                     if lv > self.camera.max_light:
                         self.camera.max_light = lv
 
-                    with self._lock:
-                        self.metrics["frames_total"] += 1
-                        self.metrics["frames_analysis"] += 1
-                        thr = self.effective_threshold
-                        if (thr is not None) and (self.metrics["first_exceed_time"] is None) and (lv > thr):
-                            if self.metrics["analysis_start"] is not None:
-                                self.metrics["first_exceed_time"] = time.perf_counter() - self.metrics["analysis_start"]
-                    time.sleep(0.05)
+                    frames += 1
+                    now = time.perf_counter()
+                    thr = self.effective_threshold
+                    if (thr is not None) and (first_exceed is None) and (lv > thr):
+                        if analysis_start is not None:
+                            first_exceed = now - analysis_start
+                    if now - last_flush >= 1.0:
+                        flush()
+                        last_flush = now
                 except Exception:
                     with self._lock:
                         self.metrics["read_errors"] += 1
-                    time.sleep(0.1)
         finally:
+            flush()
             try:
-                self.camera.close_camera()
+                # The capture thread closes the camera itself once read() returns
+                self.camera.join_capture()
+                with self._lock:
+                    self.metrics["read_errors"] += self.camera.read_errors
             except Exception:
                 pass
 
     # ---------- heatmap & contamination helpers ----------
+    def _has_heatmap(self):
+        if self.last_heatmap_bgr is not None:
+            return True
+        return bool(self.last_heatmap_path) and os.path.exists(self.last_heatmap_path)
+
+    def _io_worker(self):
+        """Background writer: save (path, image) pairs queued by _finalize_heatmap_and_metrics."""
+        while True:
+            item = self._io_q.get()
+            if item is None:  # shutdown sentinel from on_close
+                self._io_q.task_done()
+                return
+            path, img = item
+            try:
+                import cv2
+                cv2.imwrite(path, img)
+            except Exception as e:
+                print(f"[ERROR] Heatmap write failed ({path}): {e}", file=sys.stderr)
+            finally:
+                self._io_q.task_done()
+
     def _sanitize_id_for_filename(self, timestamp_id: str) -> str:
-        return timestamp_id.replace(":", "-").replace(" ", "_").replace(".", "-")
+        return timestamp_id.translate(_FILENAME_TRANS)
 
     def _finalize_heatmap_and_metrics(self, timestamp_id: str, pixel_threshold: float):
+        import cv2
         heatmap_path = None
         pct = 0.0
 
@@ -1001,20 +1243,28 @@ class TestApp:
             heatmap_path = os.path.join(out_dir, f"heatmap_{safe_id}.png")
 
             maxproj = self._heatmap_max
-            mn = float(np.min(maxproj))
-            mx = float(np.max(maxproj))
-            if mx > mn:
-                norm = (maxproj - mn) * (255.0 / (mx - mn))
-            else:
-                norm = np.zeros_like(maxproj, dtype=np.float32)
-
-            norm_u8 = np.clip(norm, 0, 255).astype(np.uint8)
-            colored = cv2.applyColorMap(norm_u8, cv2.COLORMAP_JET)
-
-            cv2.imwrite(heatmap_path, colored)
+            # Min/max, stretch to 0..255 and convert in one pass; a flat
+            # max-projection (mx == mn) comes out all zeros, as before
+            # Output buffers are reused across runs (frame size is fixed); make
+            # sure the writer is done with the previous run's image first
+            self._io_q.join()
+            self._norm_u8 = cv2.normalize(maxproj, self._norm_u8, alpha=0, beta=255, norm_type=cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+            norm_u8 = self._norm_u8
+            if self._heatmap_full_size is not None and self._heatmap_full_size != (norm_u8.shape[1], norm_u8.shape[0]):
+                self._norm_full = cv2.resize(norm_u8, self._heatmap_full_size, dst=self._norm_full, interpolation=cv2.INTER_LINEAR)
+                norm_u8 = self._norm_full
+            self._colored = cv2.applyColorMap(norm_u8, cv2.COLORMAP_JET, dst=self._colored)
+            colored = self._colored
+
+            # Encoding + writing happens on the I/O thread; keep the array for display
+            self.last_heatmap_bgr = colored
+            self._io_q.put((heatmap_path, colored))
 
             if pixel_threshold is not None:
-                over = np.count_nonzero(maxproj > float(pixel_threshold))
+                # For uint8 data "x > thr" equals "x > floor(thr)", which is exactly
+                # what cv2.threshold applies to 8-bit input; no bool temporary.
+                _, mask = cv2.threshold(maxproj, float(pixel_threshold), 255, cv2.THRESH_BINARY)
+                over = cv2.countNonZero(mask)
                 total = maxproj.size
                 pct = (100.0 * over / total) if (total > 0 and over > 0) else 0.0
             else:
@@ -2,19 +2,22 @@ import time
 import RPi.GPIO as GPIO
 from app.config import IN1, IN2, IN3, IN4, WAVE_SEQUENCE, STEP_DELAY, STEPS_PER_90_DEG
 
+# WAVE_SEQUENCE flattened once at import into immutable int tuples, so
+# step_once doesn't re-walk the config lists on every phase
+_STEP_TABLE = tuple(tuple(int(v) for v in row) for row in WAVE_SEQUENCE)
+
 class StepperMotor:
     def __init__(self):
         GPIO.setmode(GPIO.BCM)
-        GPIO.setup([IN1, IN2, IN3, IN4], GPIO.OUT, initial=GPIO.LOW)
+        self._pins = [IN1, IN2, IN3, IN4]
+        GPIO.setup(self._pins, GPIO.OUT, initial=GPIO.LOW)
         print("[DEBUG] Stepper motor initialized")
 
     def step_once(self):
-        for a, b, c, d in WAVE_SEQUENCE:
-            GPIO.output(IN1, a)
-            GPIO.output(IN2, b)
-            GPIO.output(IN3, c)
-            GPIO.output(IN4, d)
-            time.sleep(STEP_DELAY)
+        """Drive one full WAVE_SEQUENCE (via _STEP_TABLE)."""
+        for phase in _STEP_TABLE:
+            GPIO.output(self._pins, phase)  # all four coils in one call
+            time.sleep(STEP_DELAY)  # minimum hold per phase; never shortened
 
     def rotate_90(self):
         print(f"[DEBUG] Starting 90-degree rotation ({STEPS_PER_90_DEG} steps)")
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
+import os
 import tkinter as tk
 import signal
 import sys
+
+# Size OpenCV's worker pool before cv2 is first (lazily) imported: on the
+# 4-core Pi its threads would otherwise compete with Tk and the capture and
+# analysis threads. Same value camera_loop sets via cv2.setNumThreads(1).
+os.environ.setdefault("OPENCV_FOR_THREADS_NUM", "1")
+
 from app.gui import TestApp
 
 
@@ -13,10 +20,24 @@ def main():
     #root.overrideredirect(True)
     app = TestApp(root)
 
+    # Python signal handlers only run when the interpreter gets control back,
+    # which an idle Tk mainloop may not give it. The handler just sets a flag
+    # and a short after() poll (which also wakes the interpreter) acts on it.
+    shutdown_requested = False
+
     def _graceful(*_):
-        app.on_close()
+        nonlocal shutdown_requested
+        shutdown_requested = True
+
+    def _poll_shutdown():
+        if shutdown_requested:
+            app.on_close()
+        else:
+            root.after(200, _poll_shutdown)
+
     signal.signal(signal.SIGINT, _graceful)
     signal.signal(signal.SIGTERM, _graceful)
+    root.after(200, _poll_shutdown)
 
     root.mainloop()
 